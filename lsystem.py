@@ -1,6 +1,141 @@
 import turtle
 import random
 import json
+import math
+from functools import partial
+
+import numpy as np
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Integer codes of the actions used by the vectorized renderer.
+_DRAW, _MOVE, _LEFT, _RIGHT, _PUSH, _POP, _NOOP = range(7)
+_CODES = {
+    'draw_forward': _DRAW, 'move_forward': _MOVE, 'left_turn': _LEFT,
+    'right_turn': _RIGHT, 'save_state': _PUSH, 'restore_state': _POP,
+    'noop': _NOOP
+}
+# Codes of the markers, the codes of the fill markers start at _BEGIN_FILL_CODE.
+_NEXT_COLOR_CODE, _END_FILL_CODE, _BEGIN_FILL_CODE = range(7, 10)
+# Kinds of the vertices computed by the vectorized renderer.
+_JUMP, _LINE, _ARC = range(3)
+
+
+def _render_path(codes, units, turns, x, y, heading, depth, radius):
+    ''' Computes the vertices of the drawing of an encoded L-System string.
+
+    Params:
+        - codes: The action codes of the symbols.
+        - units: The forward distance of each symbol.
+        - turns: The turn angle of each symbol in radians.
+        - x, y: The starting position of the pen.
+        - heading: The starting heading in radians.
+        - depth: The size of the push / pop stack.
+        - radius: The corner radius. If greater than zero, the turns before
+            a forward move are drawn as arcs with this radius, split in parts
+            of at most half a turn.
+
+    Returns the x and y coordinates of the pen after each action that moves
+    it, the kind of each vertex (_JUMP, _LINE or _ARC) and the turn angle of
+    the arcs.
+    '''
+    n = len(codes)
+    # an arc takes at most four parts before its forward move
+    size = 5 * n if radius else n
+    xs = np.empty(size)
+    ys = np.empty(size)
+    kinds = np.empty(size, dtype=np.uint8)
+    arcs = np.zeros(size)
+    stack_x = np.empty(depth)
+    stack_y = np.empty(depth)
+    stack_h = np.empty(depth)
+    stack_t = np.empty(depth)
+    # turns are aggregated before a forward move like the turtle turnstack
+    turn = 0.0
+    sp = 0
+    k = 0
+    for i in range(n):
+        code = codes[i]
+        if code == _DRAW or code == _MOVE:
+            if turn != 0.0:
+                if radius:
+                    # a turn of a full circle or more draws the whole circle:
+                    # keep one circle and the remainder, in parts whose end
+                    # points differ
+                    sweep = abs(turn)
+                    if sweep >= 2 * math.pi:
+                        sweep = 2 * math.pi + sweep % (2 * math.pi)
+                    parts = math.ceil(sweep / math.pi)
+                    part = math.copysign(sweep / parts, turn)
+                    rho = math.copysign(radius, turn)
+                    h = heading
+                    for _ in range(parts):
+                        x += rho * (math.sin(h + part) - math.sin(h))
+                        y += rho * (math.cos(h) - math.cos(h + part))
+                        h += part
+                        xs[k] = x
+                        ys[k] = y
+                        kinds[k] = _ARC
+                        arcs[k] = part
+                        k += 1
+                heading += turn
+                turn = 0.0
+            x += (units[i] - 2 * radius) * math.cos(heading)
+            y += (units[i] - 2 * radius) * math.sin(heading)
+            xs[k] = x
+            ys[k] = y
+            kinds[k] = _LINE if code == _DRAW else _JUMP
+            k += 1
+        elif code == _LEFT or code == _RIGHT:
+            turn += turns[i]
+        elif code == _PUSH:
+            stack_x[sp] = x
+            stack_y[sp] = y
+            stack_h[sp] = heading
+            stack_t[sp] = turn
+            sp += 1
+        elif code == _POP:
+            if sp == 0:
+                raise IndexError('pop from empty stack')
+            sp -= 1
+            x = stack_x[sp]
+            y = stack_y[sp]
+            heading = stack_h[sp]
+            turn = stack_t[sp]
+            xs[k] = x
+            ys[k] = y
+            kinds[k] = _JUMP
+            k += 1
+    return xs[:k], ys[:k], kinds[:k], arcs[:k]
+
+
+def _stack_depth(codes):
+    ''' Returns the maximum number of states saved at once by the push actions. '''
+    steps = (codes == _PUSH).astype(np.int64) - (codes == _POP)
+    return int(np.cumsum(steps).max(initial=0))
+
+
+def _merge_runs(x, y, xs, ys, kinds):
+    ''' Returns the mask of the vertices that end a run of collinear lines or
+    of consecutive jumps, starting from the position x, y.
+
+    The other vertices can be skipped without changing the drawing.
+    '''
+    dx = np.diff(xs, prepend=x)
+    dy = np.diff(ys, prepend=y)
+    cross = dx[:-1] * dy[1:] - dy[:-1] * dx[1:]
+    dot = dx[:-1] * dx[1:] + dy[:-1] * dy[1:]
+    collinear = (np.abs(cross) <= 1e-9 * np.hypot(dx[:-1], dy[:-1]) * np.hypot(dx[1:], dy[1:])) \
+        & (dot > 0)
+    kind = kinds[:-1]
+    merged = (kind == kinds[1:]) & ((kind == _JUMP) | ((kind == _LINE) & collinear))
+    return np.append(~merged, True)
+
+
+if numba is not None:
+    _render_path = numba.njit(cache=True)(_render_path)
 
 class LSystem:
     ''' L-system renderer.
@@ -47,12 +182,20 @@ class LSystem:
         ']': 'restore_state'
     }
 
-    def __init__(self, rules={}, axiom='', angle=0, left_angle=None, right_angle=None, actions={}, 
-                 rand_unit=0, rand_angle=0, draw={}, trace=False, **kwargs):
+    # Private-use characters inserted in the expanded string to replay the
+    # effects bound to a rule expansion (sequential colors and filling).
+    _NEXT_COLOR = '\ue000'
+    _END_FILL = '\ue001'
+    _BEGIN_FILL = 0xe100
+
+    def __init__(self, rules=None, axiom='', angle=0, left_angle=None, right_angle=None, actions=None, 
+                 rand_unit=0, rand_angle=0, draw=None, trace=False, **kwargs):
         ''' Creates a new L-System renderer.
         
         Params:
-          - rules: The substitution rules map of the L-System.
+          - rules: The substitution rules map of the L-System. The 
+                substitutions can be strings or lists of strings. Symbols
+                are single characters, longer keys are ignored.
           - axiom: The initial axiom string of the L-System
           - angle: The angle used for turning in degrees
           - left_angle: The angle used for turning left in degrees. Defaults to
@@ -60,11 +203,16 @@ class LSystem:
           - right_angle: The angle used for turning right in degrees. Defaults to
                 None in which case `angle` will be used.
           - actions: The symbol -> action map. If None, LSystem.DEFAULT_ACTIONS
-                map will be used.
+                map will be used. Keys longer than one character are ignored.
+                Unknown action names raise ValueError when the L-System is
+                created or expanded, even for symbols that are never used.
           - rand_unit: randomize the unit length at each iteration by this 
                 percentage. Defaults to 0.
           - rand_angle: randomize the turn angle at each iteration by this 
                 percentage. Defaults to 0.
+                The random factors are drawn from a NumPy generator seeded
+                from the `random` module at each rendering, so `random.seed`
+                makes the drawings reproducible.
           - draw: additional parameters for drawing the default curve.
           - trace: print debugging messages to stdout while rendering the 
                 L-System.
@@ -90,10 +238,13 @@ class LSystem:
           - seq_colors: List of color strings to cycle when changing the color
                 of the line. Defaults to empty list (no change of color).
         '''
+        rules = rules or {}
+        draw = draw or {}
         self.left_angle = left_angle if left_angle is not None else angle
         self.right_angle = right_angle if right_angle is not None else angle
-        self.actions = actions if actions else LSystem.DEFAULT_ACTIONS
-        self.rules = rules
+        self.actions = dict(actions or LSystem.DEFAULT_ACTIONS)
+        self.rules = {var: subst if isinstance(subst, str) else ''.join(subst)
+                      for var, subst in rules.items()}
         self.axiom = axiom
         self.rand_unit = rand_unit
         self.rand_angle = rand_angle
@@ -107,20 +258,68 @@ class LSystem:
         self.seq_colors = draw.get('seq_colors', [])
         self.seq_color_order = draw.get('seq_color_order', 0)
         self.trace = trace
-        self.stack = []
         self.turnstack = 0
         self.max_x, self.max_y = (0, 0)
         self.color_index = -1
-        self._initpen()
+        # the source of the random factors, replaced by the precomputed
+        # numbers during a walk
+        self._random = random.random
+        # expansions of the symbols by order, valid for _levels_key
+        self._levels = None
+        self._levels_key = None
+        self._configure()
+        self._action_map = {
+            'draw_forward': self.draw,
+            'move_forward': self.move,
+            'left_turn': self.left,
+            'right_turn': self.right,
+            'save_state': self.push,
+            'restore_state': self.pop
+        }
+        # the turtle is created on first use, so that rendering to SVG does
+        # not need a display
+        self._pen = None
+        self._title = None
+        self._logo = False
+        self._initstate()
+
+    @property
+    def pen(self):
+        ''' The turtle drawing the L-System, created on first use. '''
+        if self._pen is None:
+            self._initpen()
+        return self._pen
+
+    @pen.setter
+    def pen(self, pen):
+        self._pen = pen
+        self._syncstate()
+
+    def _initstate(self):
+        # The pen state is tracked in floats to avoid querying the turtle.
+        # _heading is in radians, counterclockwise from the x axis.
+        self._reserve_stack(16)
+        self._x, self._y = 0.0, 0.0
+        self._heading = math.radians(90.0)
+
+    def _syncstate(self):
+        # Reads the tracked pen state from the turtle, keeping the stack.
+        self._logo = self._pen.screen.mode() == 'logo'
+        self._x, self._y = map(float, self._pen.pos())
+        heading = self._pen.heading()
+        self._heading = math.radians(90 - heading if self._logo else heading)
 
     def _initpen(self):
-        self.pen = turtle.Turtle(visible=False)
-        self.pen.speed(0)
-        self.pen.penup()
+        if self._title:
+            turtle.title(self._title)
+        self._pen = turtle.Turtle(visible=False)
+        self._pen.speed(0)
+        self._pen.penup()
         w, h = turtle.screensize()
-        self.pen.setpos(w * self.start_point[0], h * self.start_point[1])
-        self.pen.setheading(self.start_heading)
-        self.pen.pendown()
+        self._pen.setpos(w * self.start_point[0], h * self.start_point[1])
+        self._pen.setheading(self.start_heading)
+        self._pen.pendown()
+        self._syncstate()
 
     @staticmethod
     def from_json(json_filename, trace=False):
@@ -134,26 +333,46 @@ class LSystem:
         '''
         with open(json_filename) as json_file:
             json_dict = json.load(json_file)
-        turtle.title(json_filename)
-        return LSystem(**json_dict, trace=trace)
+        lsystem = LSystem(**json_dict, trace=trace)
+        # the window title is set when the turtle is created
+        lsystem._title = json_filename
+        return lsystem
 
-    def _get_angle(self, base_angle):
+    def _random_draws(self, codes):
+        # One uniform random number per randomized symbol of the codes, drawn
+        # at once from a generator seeded from `random`. Both the action walk
+        # and the vectorized renderer consume them in symbol order, so they
+        # produce the same drawing for the same seed. Returns the numbers and
+        # the mask of the randomized symbols.
+        randomized = np.zeros(len(codes), dtype=np.bool_)
+        if self.rand_unit:
+            randomized |= (codes == _DRAW) | (codes == _MOVE)
         if self.rand_angle:
-            return ((random.random() * 2 - 1) * self.rand_angle + 1) * base_angle
-        else:
+            randomized |= (codes == _LEFT) | (codes == _RIGHT)
+        rng = np.random.default_rng(random.getrandbits(64))
+        return rng.random(np.count_nonzero(randomized)), randomized
+
+    def _get_angle(self, base_angle):
+        if not self.rand_angle:
             return base_angle
+        return ((self._random() * 2 - 1) * self.rand_angle + 1) * base_angle
         
     def _get_unit(self, unit):
-        return ((random.random() * 2 - 1) * self.rand_unit + 1) * unit
+        if not self.rand_unit:
+            return unit
+        return ((self._random() * 2 - 1) * self.rand_unit + 1) * unit
         
     def draw(self, unit):
         ''' Implements the `draw` action. '''
         self._turn()
         u = self._get_unit(unit) - 2 * self.corner_radius
         self.pen.forward(u)
-        x, y = self.pen.position()
-        self.max_x = max(self.max_x, x)
-        self.max_y = max(self.max_y, y)
+        self._x += u * math.cos(self._heading)
+        self._y += u * math.sin(self._heading)
+        if self._x > self.max_x:
+            self.max_x = self._x
+        if self._y > self.max_y:
+            self.max_y = self._y
         
     def move(self, unit):
         ''' Implements the `move` action. '''
@@ -174,26 +393,65 @@ class LSystem:
 
     def _turn(self):
         # Executes the accumulated turns in the turnstack.
+        if not self.turnstack:
+            return
+        turn = math.radians(self.turnstack)
         if self.corner_radius:
             sig = -1 if self.turnstack < 0 else 1
             self.pen.circle(sig * self.corner_radius, abs(self.turnstack), int(self.corner_radius))
+            rho = sig * self.corner_radius
+            self._x += rho * (math.sin(self._heading + turn) - math.sin(self._heading))
+            self._y += rho * (math.cos(self._heading) - math.cos(self._heading + turn))
         else:
             self.pen.left(self.turnstack)
+        self._heading += turn
         self.turnstack = 0
 
+    def _update_max(self, pos):
+        x, y = pos
+        self.max_x = max(self.max_x, x)
+        self.max_y = max(self.max_y, y)
+
+    def _reserve_stack(self, depth, keep=False):
+        # Allocates the parallel arrays of the push / pop stack for `depth`
+        # states. If keep is True, the saved states are preserved.
+        if keep and depth <= len(self._stack_x):
+            return
+        stack = np.zeros((4, depth))
+        if keep:
+            stack[:, :self._sp] = (self._stack_x[:self._sp], self._stack_y[:self._sp],
+                                   self._stack_h[:self._sp], self._stack_t[:self._sp])
+        else:
+            self._sp = 0
+        self._stack_x, self._stack_y, self._stack_h, self._stack_t = stack
+
     def push(self, unit):
         ''' Implements the `push` action. '''
-        self.stack.append((self.pen.pos(), self.pen.heading(), self.turnstack))
+        sp = self._sp
+        if sp == len(self._stack_x):
+            self._reserve_stack(2 * sp, keep=True)
+        self._stack_x[sp] = self._x
+        self._stack_y[sp] = self._y
+        self._stack_h[sp] = self._heading
+        self._stack_t[sp] = self.turnstack
+        self._sp = sp + 1
 
     def pop(self, unit):
         ''' Implements the `pop` action. '''
-        pos, head, turnstack = self.stack.pop()
+        if not self._sp:
+            raise IndexError('pop from empty stack')
+        self._sp -= 1
+        sp = self._sp
+        self._x = float(self._stack_x[sp])
+        self._y = float(self._stack_y[sp])
+        self._heading = float(self._stack_h[sp])
+        heading = math.degrees(self._heading)
         self.pen.penup()
-        self.pen.setpos(pos)
-        self.pen.setheading(head)
+        self.pen.setpos(self._x, self._y)
+        self.pen.setheading(90 - heading if self._logo else heading)
         self.pen.pendown()
         self.pen.ht()
-        self.turnstack = turnstack
+        self.turnstack = float(self._stack_t[sp])
 
     def call_action(self, action, unit):
         ''' Executes an action. 
@@ -202,51 +460,316 @@ class LSystem:
             - action: the name of the action as referred by the actions map.
             - unit: Number of pixels to be used in forward draw.
         '''
-        if action == 'noop':
+        fn = self._action_map.get(action)
+        if fn is not None:
+            if self.trace:
+                print(f'action: {action} unit: {unit}')
+            fn(unit)
+        elif action != 'noop':
+            raise ValueError(f'Unknown action: {action}')
+
+    def _next_color(self, unit):
+        self.color_index = (self.color_index + 1) % len(self.seq_colors)
+        self.pen.color(self.seq_colors[self.color_index])
+
+    def _begin_fill(self, var, unit):
+        if var in self.fill_colors:
+            self.pen.color(self.fill_colors[var])
+        self.pen.begin_fill()
+
+    def _end_fill(self, unit):
+        self.pen.end_fill()
+
+    def _configure(self):
+        ''' Rebuilds the state derived from the rules, the actions and the fill
+        and color settings if any of them changed since the last call.
+        '''
+        # symbols are single characters, longer keys can never match
+        rules = {var: subst if isinstance(subst, str) else ''.join(subst)
+                 for var, subst in self.rules.items() if len(var) == 1}
+        key = (tuple(rules.items()), tuple(self.actions.items()),
+               self.fill_order, self.seq_color_order, bool(self.seq_colors))
+        if key == self._levels_key:
             return
+        fill_markers = {var: chr(LSystem._BEGIN_FILL + i) for i, var in enumerate(rules)}
+        # str.translate table mapping the symbols and markers to their codes
+        symbol_codes = {}
+        for var, action in self.actions.items():
+            if action not in _CODES:
+                raise ValueError(f'Unknown action: {action}')
+            if len(var) == 1:
+                symbol_codes[ord(var)] = _CODES[action]
+        symbol_codes[ord(LSystem._NEXT_COLOR)] = _NEXT_COLOR_CODE
+        symbol_codes[ord(LSystem._END_FILL)] = _END_FILL_CODE
+        for i, marker in enumerate(fill_markers.values()):
+            symbol_codes[ord(marker)] = _BEGIN_FILL_CODE + i
+        self._rules = rules
+        self._fill_markers = fill_markers
+        self._symbol_codes = symbol_codes
+        self._step = self._compile_rules(rules)
+        self._levels = [{var: var for var in rules}]
+        self._levels_key = key
+
+    def _compile_rules(self, rules):
+        ''' Generates the function computing one order of the expansions.
+
+        The returned function receives the expansions of the symbols at the
+        previous order, the marker of the color change, the map of the fill
+        markers and the end fill marker (empty strings where they do not
+        apply), and returns the expansions at the next order. The rules are
+        inlined in its source, so each expansion is a single join.
+
+        Params:
+            - rules: The substitution rules with string substitutions.
+        '''
+        names = {var: f's{i}' for i, var in enumerate(rules)}
+        lines = ['def _step(level, color, fill, end):']
+        for var, name in names.items():
+            lines.append(f'    {name} = level[{var!r}]')
+        lines.append('    return {')
+        for var, rule in rules.items():
+            terms = []
+            literal = ''
+            for c in rule:
+                if c in names:
+                    if literal:
+                        terms.append(repr(literal))
+                        literal = ''
+                    terms.append(names[c])
+                else:
+                    literal += c
+            if literal:
+                terms.append(repr(literal))
+            terms = ''.join(f'{term}, ' for term in terms)
+            lines.append(f"        {var!r}: ''.join((color, fill[{var!r}], {terms}end)),")
+        lines.append('    }')
+        namespace = {}
+        exec('\n'.join(lines), namespace)
+        return namespace['_step']
+
+    def _expand(self, string, order):
+        ''' Applies the substitution rules `order` times on a string.
+
+        Expansions at `seq_color_order` and `fill_order` are wrapped in marker
+        characters that are replayed by `execute`. The expansions of the 
+        symbols are computed once per order and cached until the attributes
+        they depend on change.
+
+        Params:
+            - string: The L-System string to be expanded.
+            - order: The number of recursions to be unfolded.
+        '''
+        self._configure()
         if self.trace:
-            print(f'action: {action} unit: {unit}')
-        map = {
-            'draw_forward': self.draw,
-            'move_forward': self.move,
-            'left_turn': self.left,
-            'right_turn': self.right,
-            'save_state': self.push,
-            'restore_state': self.pop
-        }
-        if action in map:
-            map[action](unit)
-        else:
-            raise ValueError(f'Unknown action: {action}')
+            # the rules applied at each order to the symbols that occur
+            symbols = set(string)
+            for o in range(order, 0, -1):
+                applied = [var for var in self._rules if var in symbols]
+                for var in applied:
+                    print(f'order #{o}: {var} -> {self._rules[var]}')
+                symbols = symbols.difference(applied).union(*map(self._rules.get, applied))
+        levels = self._levels
+        no_fill = dict.fromkeys(self._rules, '')
+        while len(levels) <= order:
+            o = len(levels)
+            color = LSystem._NEXT_COLOR if self.seq_colors and o == self.seq_color_order else ''
+            if o == self.fill_order:
+                levels.append(self._step(levels[-1], color, self._fill_markers, LSystem._END_FILL))
+            else:
+                levels.append(self._step(levels[-1], color, no_fill, ''))
+        # str.translate replaces every symbol with its expansion in one C pass
+        level = levels[max(order, 0)]
+        return string.translate({ord(var): subst for var, subst in level.items()})
+
+    def _encode(self, string):
+        ''' Encodes an expanded string to the bytes of its action codes. '''
+        table = self._symbol_codes
+        unknown = {ord(var): _NOOP for var in set(string) if ord(var) not in table}
+        if unknown:
+            table = {**table, **unknown}
+        return string.translate(table).encode('latin-1')
+
+    def _run(self, codes, unit, string):
+        ''' Calls the actions of the encoded symbols of an expanded string. '''
+        # create the turtle before the walk, so that it starts from its state
+        self.pen
+        array = np.frombuffer(codes, dtype=np.uint8)
+        self._reserve_stack(self._sp + _stack_depth(array), keep=True)
+        handlers = [None] * _BEGIN_FILL_CODE
+        for action, code in _CODES.items():
+            handlers[code] = self._action_map.get(action)
+        handlers[_NEXT_COLOR_CODE] = self._next_color
+        handlers[_END_FILL_CODE] = self._end_fill
+        handlers.extend(partial(self._begin_fill, var) for var in self._fill_markers)
+        if self.rand_unit or self.rand_angle:
+            self._random = iter(self._random_draws(array)[0].tolist()).__next__
+        try:
+            if self.trace:
+                names = {code: action for action, code in _CODES.items()}
+                for var, code in zip(string, codes):
+                    fn = handlers[code]
+                    if fn is not None:
+                        if code in names:
+                            print(f'{var} -> [{names[code]}]')
+                            print(f'action: {names[code]} unit: {unit}')
+                        fn(unit)
+            else:
+                for code in codes:
+                    fn = handlers[code]
+                    if fn is not None:
+                        fn(unit)
+        finally:
+            self._random = random.random
 
     def execute(self, string, order, unit):
         ''' Executes the actions derived from a given string.
         
+        The string is first expanded to its final form and encoded to action
+        codes, which are then walked once calling the actions.
+
         Params:
             - string: The L-System string to be executed.
             - order: The remaining order (number of recursions) to be unfolded.
             - unit: Number of pixels to be used in forward draw.
         '''
-        for var in string:
-            if order <= 0 or var not in self.rules.keys():
-                action = self.actions.get(var, 'noop')
-                if self.trace and action != 'noop':
-                    print(f'order #{order}: {var} -> [{action}]')
-                self.call_action(action, unit)
+        string = self._expand(string, order)
+        self._run(self._encode(string), unit, string)
+
+    def _path(self, codes, unit, x, y, heading, radius=0):
+        ''' Computes the vertices of the drawing of an encoded string.
+
+        The pen state is computed by the `_render_path` kernel when numba is
+        available or rounded corners are requested, otherwise with cumulative
+        sums over the symbols between two consecutive push or pop actions.
+
+        Params:
+            - codes: The action codes of the expanded L-System string.
+            - unit: Number of pixels to be used in forward draw.
+            - x, y: The starting position of the pen.
+            - heading: The starting heading in degrees, counterclockwise
+                from the x axis.
+            - radius: The corner radius.
+
+        Returns the vertices as computed by `_render_path`.
+        '''
+        codes = np.frombuffer(codes, dtype=np.uint8)
+        n = len(codes)
+        is_draw = codes == _DRAW
+        is_forward = is_draw | (codes == _MOVE)
+        is_turn = (codes == _LEFT) | (codes == _RIGHT)
+        units = is_forward * float(unit)
+        turns = np.zeros(n)
+        turns[codes == _LEFT] = math.radians(self.left_angle)
+        turns[codes == _RIGHT] = -math.radians(self.right_angle)
+        if self.rand_unit or self.rand_angle:
+            draws, randomized = self._random_draws(codes)
+            factors = np.ones(n)
+            factors[randomized] = draws * 2 - 1
+            if self.rand_unit:
+                units[is_forward] *= factors[is_forward] * self.rand_unit + 1
+            if self.rand_angle:
+                turns[is_turn] *= factors[is_turn] * self.rand_angle + 1
+        h = math.radians(heading)
+        if numba is not None or radius:
+            return _render_path(codes, units, turns, float(x), float(y), h, _stack_depth(codes),
+                                float(radius))
+        is_stack = (codes == _PUSH) | (codes == _POP)
+        xs = np.empty(n)
+        ys = np.empty(n)
+        stack = []
+        start = 0
+        for end in np.flatnonzero(is_stack).tolist() + [n]:
+            if end > start:
+                hs = h + np.cumsum(turns[start:end])
+                xs[start:end] = x + np.cumsum(units[start:end] * np.cos(hs))
+                ys[start:end] = y + np.cumsum(units[start:end] * np.sin(hs))
+                x, y, h = xs[end - 1], ys[end - 1], hs[-1]
+            if end == n:
+                break
+            if codes[end] == _PUSH:
+                stack.append((x, y, h))
             else:
-                if self.seq_color_order and self.seq_colors and order == self.seq_color_order:
-                    self.color_index = (self.color_index + 1) % len(self.seq_colors)
-                    self.pen.color(self.seq_colors[self.color_index])
-                if self.trace:
-                    print(f'order #{order}: {var} -> {self.rules[var]}')
-                if order == self.fill_order:
-                    if var in self.fill_colors:
-                        self.pen.color(self.fill_colors[var])
-                    self.pen.begin_fill()
-                for subst in self.rules[var]:
-                    self.execute(subst, order-1, unit)
-                if order == self.fill_order:
-                    self.pen.end_fill()
+                x, y, h = stack.pop()
+            xs[end], ys[end] = x, y
+            start = end + 1
+        vertices = is_forward | (codes == _POP)
+        kinds = np.where(is_draw[vertices], _LINE, _JUMP).astype(np.uint8)
+        return xs[vertices], ys[vertices], kinds, np.zeros(len(kinds))
+
+    def _draw_path(self, codes, unit):
+        # Draws an encoded string with the vertices computed by _path.
+        x, y = self._x, self._y
+        xs, ys, kinds, _ = self._path(codes, unit, x, y, math.degrees(self._heading))
+        if not len(xs):
+            return
+        self._update_max((float(xs.max()), float(ys.max())))
+        self._x, self._y = float(xs[-1]), float(ys[-1])
+        # a single setpos for each straight run of lines
+        keep = _merge_runs(x, y, xs, ys, kinds)
+        xs, ys, down = xs[keep], ys[keep], kinds[keep] == _LINE
+        pen = self.pen
+        pen_down = True
+        for x, y, d in zip(xs.tolist(), ys.tolist(), down.tolist()):
+            if d != pen_down:
+                if d:
+                    pen.pendown()
+                else:
+                    pen.penup()
+                pen_down = d
+            pen.setpos(x, y)
+        pen.pendown()
+
+    def render_svg(self, filename, order=None, unit=None, stroke='black'):
+        ''' Renders the L-System to an SVG file.
+
+        The drawing is computed with the vectorized renderer and written as
+        a single SVG path, without using the turtle graphics engine. Rounded
+        corners are drawn as arcs, filling and sequential colors are not
+        rendered.
+
+        Params:
+            - filename: The name of the SVG file to be written.
+            - order: The order (number of recursions) to be unfolded.
+            - unit: Number of pixels to be used in forward draw.
+            - stroke: The color of the line.
+        '''
+        if not order:
+            order = self.default_order
+        if not unit:
+            unit = self.default_unit
+        codes = self._encode(self._expand(self.axiom, order))
+        # the start heading follows the logo convention of demo
+        xs, ys, kinds, arcs = self._path(codes, unit, 0.0, 0.0, 90 - self.start_heading,
+                                         self.corner_radius)
+        if len(xs):
+            self._update_max((float(xs.max()), float(ys.max())))
+            keep = _merge_runs(0.0, 0.0, xs, ys, kinds)
+            xs, ys, kinds, arcs = xs[keep], ys[keep], kinds[keep], arcs[keep]
+        r = self.corner_radius
+        parts = ['M0 0']
+        append = parts.append
+        # the y axis of SVG points downwards
+        for x, y, kind, arc in zip(xs.tolist(), (-ys).tolist(), kinds.tolist(), arcs.tolist()):
+            if kind == _LINE:
+                append(f'L{x:.2f} {y:.2f}')
+            elif kind == _ARC:
+                # the arcs are at most half a turn, so never the large one
+                sweep = 0 if arc > 0 else 1
+                append(f'A{r} {r} 0 0 {sweep} {x:.2f} {y:.2f}')
+            else:
+                append(f'M{x:.2f} {y:.2f}')
+        margin = r + 1
+        min_x = float(xs.min(initial=0)) - margin
+        max_x = float(xs.max(initial=0)) + margin
+        min_y = float(-ys.max(initial=0)) - margin
+        max_y = float(-ys.min(initial=0)) + margin
+        width, height = max_x - min_x, max_y - min_y
+        with open(filename, 'w') as svg_file:
+            svg_file.write(
+                f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" '
+                f'height="{height:.0f}" viewBox="{min_x:.2f} {min_y:.2f} {width:.2f} {height:.2f}">\n'
+                f'<path fill="none" stroke="{stroke}" d="{" ".join(parts)}"/>\n'
+                '</svg>\n')
 
     def demo(self, order=None, unit=None, **kwargs):
         ''' Draws the L-System with the predefined drawing arguments. 
@@ -262,8 +785,16 @@ class LSystem:
         turtle.mode('logo')
         turtle.clearscreen()
         turtle.tracer(False)
+        self._initstate()
         self._initpen()
-        self.execute(self.axiom, order, unit)
+        string = self._expand(self.axiom, order)
+        codes = self._encode(string)
+        has_markers = np.frombuffer(codes, dtype=np.uint8).max(initial=0) > _NOOP
+        if not has_markers and not self.corner_radius and not self.trace:
+            # no markers, rounded corners or tracing: use the vectorized path
+            self._draw_path(codes, unit)
+        else:
+            self._run(codes, unit, string)
         turtle.update()
 
 if __name__ == '__main__':